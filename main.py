@@ -3,26 +3,185 @@
 """
 英语单词趣味猜词游戏
 主程序入口
+
+用法:
+    python main.py                   正常启动游戏
+    python main.py --startup-report  输出启动耗时报告并记录到基准文件，
+                                     首帧超出预算时以状态码 2 退出
 """
 
 import sys
 import os
+import time
+
+# 进程启动基准时间（尽量早地记录）
+_START_TIME = time.perf_counter()
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from toolkit.ui import WordGameUI
+# 首帧时间预算（毫秒），--startup-report 超出时以 BUDGET_EXCEEDED_EXIT_CODE 退出
+FIRST_PAINT_BUDGET_MS = 500
+BUDGET_EXCEEDED_EXIT_CODE = 2
+
+# 启动基准记录文件及保留条数
+# 耗时与机器相关，历史记录保存在运行测速的机器本地（不纳入版本库），预算由退出状态码把关
+STARTUP_BENCH_FILE = "startup_bench.json"
+STARTUP_BENCH_KEEP = 100
+
+
+class _TimedLoader:
+    """包装模块的加载器，统计 create_module 与 exec_module 的耗时"""
+
+    def __init__(self, timer, loader):
+        self.timer = timer
+        self.loader = loader
+        self.t0 = 0.0
+
+    def create_module(self, spec):
+        self.t0 = time.perf_counter()
+        self.timer.children.append(0)
+        try:
+            create_module = getattr(self.loader, 'create_module', None)
+            return create_module(spec) if create_module is not None else None
+        except BaseException:
+            self.timer.children.pop()
+            raise
+
+    def exec_module(self, module):
+        try:
+            self.loader.exec_module(module)
+        finally:
+            # 导入完成后换回原加载器，不影响模块之后的使用
+            module.__loader__ = self.loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self.loader
+            self.timer.finish(module.__name__, self.t0)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class ImportTimer:
+    """记录每个模块的导入耗时，输出格式与 python -X importtime 相同
+
+    作为 sys.meta_path 的第一个查找器，把其他查找器找到的模块规格中的加载器
+    换成 _TimedLoader，因此首帧之后 _deferred_load 中的导入同样会被统计。
+    """
+
+    def __init__(self):
+        self.records = []  # [(模块名, 自身微秒, 累计微秒, 嵌套深度, 完成时间)]，按完成顺序
+        self.children = []  # 栈：每个正在导入的模块中已完成的子模块累计耗时（微秒）
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, 'find_spec', None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(self, spec.loader)
+        return spec
+
+    def finish(self, name, t0):
+        end = time.perf_counter()
+        cumulative = int((end - t0) * 1e6)
+        children = self.children.pop()
+        if self.children:
+            self.children[-1] += cumulative
+        self.records.append((name, cumulative - children, cumulative, len(self.children), end))
+
+
+def _elapsed_ms(mark):
+    """某个时间点相对进程启动的毫秒数"""
+    if mark is None:
+        return None
+    return round((mark - _START_TIME) * 1000, 1)
+
+
+def _print_import_tree(title, records):
+    """按 python -X importtime 的格式打印一组导入记录，返回顶层模块的累计耗时（微秒）"""
+    print(title)
+    print("import time: self [us] | cumulative | imported package")
+    total = 0
+    for name, own, cumulative, depth, _ in records:
+        print(f"import time: {own:>9} | {cumulative:>10} | {'  ' * depth}{name}")
+        if depth == 0:
+            total += cumulative
+    return total
+
+
+def print_startup_report(records, marks):
+    """打印启动报告（首帧前后分别列出各模块导入耗时）并记录基准"""
+    first_paint = marks.get('first_paint')
+    before = [r for r in records if first_paint is None or r[4] <= first_paint]
+    after = [r for r in records if first_paint is not None and r[4] > first_paint]
+    import_us = _print_import_tree("首帧之前的导入:", before)
+    deferred_us = _print_import_tree("首帧之后的导入（_deferred_load 等）:", after)
+
+    result = {
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'import_ms': round(import_us / 1000, 1),
+        'deferred_import_ms': round(deferred_us / 1000, 1),
+        'widgets_ms': _elapsed_ms(marks.get('widgets')),
+        'first_paint_ms': _elapsed_ms(marks.get('first_paint')),
+        'libraries_ms': _elapsed_ms(marks.get('libraries')),
+    }
+    print(f"首帧前导入: {result['import_ms']} ms，首帧后导入: {result['deferred_import_ms']} ms")
+    print(f"界面构建完成: {result['widgets_ms']} ms")
+    print(f"首帧绘制完成: {result['first_paint_ms']} ms (预算 {FIRST_PAINT_BUDGET_MS} ms)")
+    print(f"词库加载完成: {result['libraries_ms']} ms")
+    result['over_budget'] = (result['first_paint_ms'] is None
+                             or result['first_paint_ms'] > FIRST_PAINT_BUDGET_MS)
+    if result['over_budget']:
+        print("错误: 首帧时间超出预算！")
+
+    # 追加到基准文件，便于跟踪首帧时间的变化
+    from toolkit.utils import GameUtils
+    bench = GameUtils.load_game_stats(STARTUP_BENCH_FILE)
+    runs = bench.get('runs', [])
+    runs.append(result)
+    bench['runs'] = runs[-STARTUP_BENCH_KEEP:]
+    bench['first_paint_budget_ms'] = FIRST_PAINT_BUDGET_MS
+    GameUtils.save_game_stats(bench, STARTUP_BENCH_FILE)
+    return result
+
 
 def main():
     """主函数"""
+    startup_report = '--startup-report' in sys.argv[1:]
+    timer = ImportTimer()
+    if startup_report:
+        timer.install()
     try:
+        # 只导入首帧所需的界面模块，游戏逻辑和词库在窗口显示后再加载
+        from toolkit.ui import WordGameUI
+
         # 创建并运行游戏界面
-        app = WordGameUI()
+        app = WordGameUI(exit_after_load=startup_report)
         app.run()
+
+        if startup_report:
+            timer.uninstall()
+            result = print_startup_report(timer.records, app.startup_marks)
     except Exception as e:
         print(f"程序启动失败: {e}")
         input("按回车键退出...")
         sys.exit(1)
+        
+    if startup_report and result['over_budget']:
+        sys.exit(BUDGET_EXCEEDED_EXIT_CODE)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
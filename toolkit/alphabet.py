@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字母表模块
+提供可插拔的字母表：NFC规范化、大小写折叠、按字素簇计算长度，
+以及加载时一次性把单词编码为整数序列，供反馈计算和校验使用
+"""
+
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 各字母表通用的单词内符号（如 trade-off、o'clock）
+WORD_SYMBOLS = "-'"
+
+ZERO_WIDTH_JOINER = '\u200d'
+
+
+def split_graphemes(text: str) -> List[str]:
+    """按字素簇切分：基础字符连同其后的组合符号、变体选择符、零宽连接视为一个字母"""
+    if text.isascii():
+        return list(text)
+    clusters = []
+    for ch in text:
+        if clusters and (unicodedata.category(ch).startswith('M')
+                         or ch == ZERO_WIDTH_JOINER
+                         or '\ufe00' <= ch <= '\ufe0f'
+                         or clusters[-1].endswith(ZERO_WIDTH_JOINER)):
+            clusters[-1] += ch
+        else:
+            clusters.append(ch)
+    return clusters
+
+
+def grapheme_length(text: str) -> int:
+    """按字素簇计算长度"""
+    if text.isascii():
+        return len(text)
+    return len(split_graphemes(text))
+
+
+class Alphabet:
+    """字母表：负责单词规范化与整数编码"""
+    
+    def __init__(self, name: str, letters: Optional[str] = None, symbols: str = WORD_SYMBOLS):
+        """letters 为 None 时表示通用字母表：任何字母开头的字素簇都可使用，编码按需分配"""
+        self.name = name
+        self.fixed = letters is not None
+        self.letters = []  # 编码 -> 字母（字素簇）
+        self.codes = {}  # 字母（字素簇） -> 编码
+        self._lock = threading.Lock()
+        if letters is not None:
+            for letter in split_graphemes(unicodedata.normalize('NFC', letters + symbols)):
+                self._add(letter)
+        else:
+            for letter in symbols:
+                self._add(letter)
+    
+    def _add(self, letter: str) -> int:
+        code = self.codes.get(letter)
+        if code is None:
+            code = len(self.letters)
+            self.letters.append(letter)
+            self.codes[letter] = code
+        return code
+    
+    @staticmethod
+    def normalize_raw(word: str) -> str:
+        """与字母表无关的初步规范化（NFC + 小写），用于识别词库所用的字母表"""
+        word = word.strip()
+        if word.isascii():
+            return word.lower()
+        return unicodedata.normalize('NFC', word).lower()
+    
+    def normalize(self, word: str) -> str:
+        """NFC规范化并折叠大小写；字母表中已有的小写字母（如德语 ß）不再被折叠展开"""
+        word = word.strip()
+        if word.isascii():
+            return word.lower()
+        folded = []
+        for cluster in split_graphemes(unicodedata.normalize('NFC', word)):
+            lowered = cluster.lower()
+            folded.append(lowered if self.fixed and lowered in self.codes else cluster.casefold())
+        return unicodedata.normalize('NFC', ''.join(folded))
+    
+    def encode(self, word: str) -> Optional[Tuple[int, ...]]:
+        """把已规范化的单词编码为整数元组，含有字母表之外的字符时返回 None"""
+        codes = self.codes
+        result = []
+        for cluster in split_graphemes(word):
+            code = codes.get(cluster)
+            if code is None:
+                if self.fixed or not cluster[0].isalpha():
+                    return None
+                with self._lock:
+                    code = self._add(cluster)
+            result.append(code)
+        return tuple(result)
+    
+    def decode(self, codes: Iterable[int]) -> List[str]:
+        """把整数编码还原为字母列表"""
+        letters = self.letters
+        return [letters[code] for code in codes]
+    
+    def covers(self, letters: Iterable[str]) -> bool:
+        """字母表是否包含给定的全部字母"""
+        if not self.fixed:
+            return all(letter in self.codes or letter[0].isalpha() for letter in letters)
+        return all(letter in self.codes for letter in letters)
+    
+    def is_valid(self, word: str) -> bool:
+        """单词是否只由本字母表中的字母组成（且至少含有一个字母）"""
+        if not word:
+            return False
+        clusters = split_graphemes(self.normalize(word))
+        if not any(cluster[0].isalpha() for cluster in clusters):
+            return False
+        return self.covers(clusters)
+
+
+ENGLISH = Alphabet('en', 'abcdefghijklmnopqrstuvwxyz')
+GERMAN = Alphabet('de', 'abcdefghijklmnopqrstuvwxyzäöüß')
+FRENCH = Alphabet('fr', 'abcdefghijklmnopqrstuvwxyzàâæçéèêëîïôœùûüÿ')
+PINYIN = Alphabet('pinyin', 'abcdefghijklmnopqrstuvwxyzü'
+                            'āáǎàēéěèīíǐìōóǒòūúǔùǖǘǚǜ')
+
+# 已注册的字母表，自动识别时按注册顺序优先选用
+ALPHABETS: Dict[str, Alphabet] = {}
+
+
+def register_alphabet(alphabet: Alphabet):
+    """注册字母表"""
+    ALPHABETS[alphabet.name] = alphabet
+
+
+for _alphabet in (ENGLISH, GERMAN, FRENCH, PINYIN):
+    register_alphabet(_alphabet)
+
+
+def detect_alphabet(words: Iterable[str]) -> Alphabet:
+    """选出第一个能覆盖全部单词的已注册字母表，都不满足时返回新的通用字母表"""
+    letters = set()
+    for word in words:
+        if word.isascii():
+            letters.update(word)
+        else:
+            letters.update(split_graphemes(word))
+    for alphabet in ALPHABETS.values():
+        if alphabet.covers(letters):
+            return alphabet
+    return Alphabet('unicode')
+
+
+# 通用字母表，用于未指定字母表时的单词格式校验
+UNICODE = Alphabet('unicode')
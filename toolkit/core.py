@@ -1,20 +1,72 @@
 import random
 import os
+import time
+import hashlib
 from typing import List, Tuple, Optional
+from toolkit.alphabet import Alphabet, detect_alphabet
+
+class LibraryIndex:
+    """单个词库的索引：加载时一次性完成规范化与整数编码"""
+    
+    def __init__(self, name: str, raw_words: List[str], alphabet: Optional[Alphabet] = None):
+        self.name = name
+        self.alphabet = alphabet or detect_alphabet(Alphabet.normalize_raw(word) for word in raw_words)
+        self.words = []  # 规范化后的单词列表（保持文件顺序，序号即记录中的单词序号）
+        self.codes = []  # 与 words 对应的整数编码
+        self.index = {}  # {单词: 序号}
+        self.by_length = {}  # {字母数: [序号列表]}
+        self.signature = None  # 读取词库文件时的 (修改时间ns, 文件大小)，由 from_file 记录，供热更新比较
+        
+        for raw in raw_words:
+            word = self.alphabet.normalize(raw)
+            codes = self.alphabet.encode(word)
+            if not word or codes is None:
+                continue
+            i = len(self.words)
+            self.words.append(word)
+            self.codes.append(codes)
+            self.index.setdefault(word, i)
+            self.by_length.setdefault(len(codes), []).append(i)
+        
+        # 快照版本：单词列表内容的哈希，记录中的单词序号只对同一版本有效
+        digest = hashlib.blake2b('\n'.join(self.words).encode('utf-8'), digest_size=8).digest()
+        self.version = int.from_bytes(digest, 'little')
+    
+    @classmethod
+    def from_file(cls, name: str, filepath: str) -> 'LibraryIndex':
+        """从词库文件构建索引"""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            # 读取前记录文件状态：读取期间文件被修改时，监视器之后仍会发现变化
+            stat = os.fstat(f.fileno())
+            words = [word.strip() for word in f.readlines() if word.strip()]
+        index = cls(name, words)
+        index.signature = (stat.st_mtime_ns, stat.st_size)
+        return index
+    
+    def lookup(self, word: str) -> Optional[int]:
+        """查找单词序号，word 需已规范化"""
+        return self.index.get(word)
 
 class WordGame:
     """英语单词猜词游戏核心逻辑"""
     
     def __init__(self):
-        self.word_library = {}  # 词库字典 {词库名: 单词列表}
+        # 词库目录快照 ({词库名: LibraryIndex}, {词库名: 单词列表})，热更新时整体替换这个元组
+        self._catalog = ({}, {})
         self.current_library = None  # 当前选择的词库名
+        self.library = None  # 本局使用的词库快照，词库热更新后本局仍沿用它直到结束
         self.target_word = ""  # 目标单词
-        self.word_length = 0  # 目标单词长度
+        self.target_codes = ()  # 目标单词的整数编码
+        self.word_length = 0  # 目标单词长度（按字母/字素簇计）
         self.max_attempts = 0  # 最大尝试次数
         self.attempts = []  # 已尝试的单词列表
         self.game_over = True  # 游戏是否结束
         self.won = False  # 是否获胜
-        
+        self.abandoned = False  # 是否中途放弃（未分胜负就开始新局或退出）
+        self.start_time = 0.0  # 本局开始时间戳
+        self.attempt_times = []  # 每次尝试的时间戳
+        self.recorder = None  # 对局记录器（可选），游戏结束或放弃时调用其 record_game(game)
+    
     def load_word_libraries(self, wordlib_dir: str = "wordlib") -> dict:
         """加载词库目录下的所有词库文件"""
         if not os.path.exists(wordlib_dir):
@@ -26,14 +78,41 @@ class WordGame:
                 library_name = filename.replace('.txt', '')
                 filepath = os.path.join(wordlib_dir, filename)
                 try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        words = [word.strip().lower() for word in f.readlines() if word.strip()]
-                    libraries[library_name] = words
+                    libraries[library_name] = LibraryIndex.from_file(library_name, filepath)
                 except Exception as e:
                     print(f"加载词库 {filename} 失败: {e}")
                     
-        self.word_library = libraries
-        return libraries
+        word_library = {name: index.words for name, index in libraries.items()}
+        self._catalog = (libraries, word_library)
+        return word_library
+    
+    @property
+    def libraries(self) -> dict:
+        """词库索引 {词库名: LibraryIndex}"""
+        return self._catalog[0]
+    
+    @property
+    def word_library(self) -> dict:
+        """词库字典 {词库名: 单词列表}"""
+        return self._catalog[1]
+    
+    def install_library(self, index: LibraryIndex):
+        """安装或替换单个词库（复制后一次性替换整个目录快照）"""
+        libraries, word_library = self._catalog
+        libraries = dict(libraries)
+        libraries[index.name] = index
+        word_library = dict(word_library)
+        word_library[index.name] = index.words
+        self._catalog = (libraries, word_library)
+    
+    def remove_library(self, library_name: str):
+        """移除单个词库，进行中的对局仍持有原快照"""
+        libraries, word_library = self._catalog
+        libraries = dict(libraries)
+        libraries.pop(library_name, None)
+        word_library = dict(word_library)
+        word_library.pop(library_name, None)
+        self._catalog = (libraries, word_library)
     
     def select_library(self, library_name: str) -> bool:
         """选择词库"""
@@ -44,59 +123,88 @@ class WordGame:
     
     def get_available_lengths(self) -> List[int]:
         """获取当前词库中可用的单词长度"""
-        if not self.current_library:
+        library = self.libraries.get(self.current_library)
+        if library is None:
             return []
-        
-        lengths = set()
-        for word in self.word_library[self.current_library]:
-            lengths.add(len(word))
-        return sorted(list(lengths))
+            
+        return sorted(library.by_length)
     
     def start_new_game(self, word_length: int) -> bool:
         """开始新游戏"""
-        if not self.current_library:
+        library = self.libraries.get(self.current_library)
+        if library is None:
             return False
             
         # 筛选指定长度的单词
-        available_words = [word for word in self.word_library[self.current_library] 
-                          if len(word) == word_length]
+        available = library.by_length.get(word_length)
         
-        if not available_words:
+        if not available:
             return False
             
         # 随机选择目标单词
-        self.target_word = random.choice(available_words)
-        self.word_length = word_length
-        self.max_attempts = word_length + 1
-        self.attempts = []
+        self.begin_game(library.words[random.choice(available)], library)
+        return True
+    
+    def begin_game(self, target_word: str, library: Optional[LibraryIndex] = None):
+        """以指定目标单词开始一局（回放时复用同一对象，不重新分配列表）"""
+        if library is None:
+            library = self.libraries[self.current_library]
+        self.abandon_game()
+        self.library = library
+        self.target_word = target_word
+        self.target_codes = library.codes[library.lookup(target_word)]
+        self.word_length = len(self.target_codes)
+        self.max_attempts = self.word_length + 1
+        self.attempts.clear()
+        self.attempt_times.clear()
+        self.start_time = time.time()
         self.game_over = False
         self.won = False
-        
-        return True
+        self.abandoned = False
+    
+    def abandon_game(self):
+        """放弃进行中的对局（开始新局或退出时调用），并记录下来"""
+        if self.game_over:
+            return
+        self.game_over = True
+        self.won = False
+        self.abandoned = True
+        if self.recorder is not None:
+            self.recorder.record_game(self)
     
     def is_valid_word(self, word: str) -> bool:
-        """检查单词是否在词库中"""
-        if not self.current_library:
+        """检查单词是否在词库中（对局进行中以本局的词库快照为准）"""
+        if self.library is not None and not self.game_over:
+            library = self.library
+        else:
+            library = self.libraries.get(self.current_library)
+        if library is None:
             return False
-        return word.lower() in self.word_library[self.current_library]
+        return library.lookup(library.alphabet.normalize(word)) is not None
     
     def make_guess(self, word: str) -> Optional[List[Tuple[str, str]]]:
         """进行猜测，返回颜色反馈"""
-        word = word.lower().strip()
+        library = self.library
+        if library is None:
+            return None
+        word = library.alphabet.normalize(word)
         
-        # 检查单词长度
-        if len(word) != self.word_length:
+        # 检查单词是否在词库中
+        i = library.lookup(word)
+        if i is None:
             return None
             
-        # 检查单词是否在词库中
-        if not self.is_valid_word(word):
+        # 检查单词长度
+        codes = library.codes[i]
+        if len(codes) != self.word_length:
             return None
             
         # 添加到尝试列表
         self.attempts.append(word)
+        self.attempt_times.append(time.time())
         
         # 生成颜色反馈
-        feedback = self._generate_feedback(word)
+        feedback = self._feedback_from_codes(codes, library.alphabet)
         
         # 检查游戏状态
         if word == self.target_word:
@@ -106,36 +214,50 @@ class WordGame:
             self.game_over = True
             self.won = False
             
+        # 记录已结束的对局
+        if self.game_over and self.recorder is not None:
+            self.recorder.record_game(self)
+            
         return feedback
     
-    def _generate_feedback(self, word: str) -> List[Tuple[str, str]]:
-        """生成颜色反馈：('字母', '颜色')"""
-        feedback = []
-        target_letters = list(self.target_word)
-        word_letters = list(word)
+    def _generate_feedback(self, word: str) -> Optional[List[Tuple[str, str]]]:
+        """生成颜色反馈：('字母', '颜色')；尚未开局或单词含字母表之外的字符时返回 None"""
+        library = self.library
+        if library is None:
+            return None
+        word = library.alphabet.normalize(word)
+        i = library.lookup(word)
+        codes = library.codes[i] if i is not None else library.alphabet.encode(word)
+        if codes is None:
+            return None
+        return self._feedback_from_codes(codes, library.alphabet)
+    
+    def _feedback_from_codes(self, codes: Tuple[int, ...], alphabet: Alphabet) -> List[Tuple[str, str]]:
+        """在整数编码上计算颜色反馈"""
+        target_codes = list(self.target_codes)
+        word_codes = list(codes)
+        letters = alphabet.decode(codes)
+        colors = []
         
         # 第一遍：标记绿色（正确位置）
-        for i in range(len(word_letters)):
-            if word_letters[i] == target_letters[i]:
-                feedback.append((word_letters[i], 'green'))
-                target_letters[i] = '*'  # 标记已使用
-                word_letters[i] = '#'  # 标记已处理
+        for i in range(len(word_codes)):
+            if i < len(target_codes) and word_codes[i] == target_codes[i]:
+                colors.append('green')
+                target_codes[i] = -1  # 标记已使用
+                word_codes[i] = -2  # 标记已处理
             else:
-                feedback.append((word_letters[i], 'red'))
-        
+                colors.append('red')
+                
         # 第二遍：标记黄色（错误位置）
-        for i in range(len(word_letters)):
-            if word_letters[i] != '#':  # 未处理的字母
-                if word_letters[i] in target_letters:
+        for i in range(len(word_codes)):
+            if word_codes[i] != -2:  # 未处理的字母
+                if word_codes[i] in target_codes:
                     # 找到第一个未使用的相同字母
-                    for j in range(len(target_letters)):
-                        if target_letters[j] == word_letters[i]:
-                            target_letters[j] = '*'
-                            feedback[i] = (word_letters[i], 'yellow')
-                            break
+                    target_codes[target_codes.index(word_codes[i])] = -1
+                    colors[i] = 'yellow'
                 # 否则保持红色
                 
-        return feedback
+        return list(zip(letters, colors))
     
     def get_game_status(self) -> dict:
         """获取游戏状态"""
@@ -152,17 +274,15 @@ class WordGame:
     
     def get_library_info(self) -> dict:
         """获取词库信息"""
-        if not self.current_library:
+        library = self.libraries.get(self.current_library)
+        if library is None:
             return {}
             
-        words = self.word_library[self.current_library]
-        length_stats = {}
-        for word in words:
-            length = len(word)
-            length_stats[length] = length_stats.get(length, 0) + 1
-            
+        length_stats = {length: len(indices) for length, indices in library.by_length.items()}
+        
         return {
             'name': self.current_library,
-            'total_words': len(words),
-            'length_stats': length_stats
-        } 
\ No newline at end of file
+            'total_words': len(library.words),
+            'length_stats': length_stats,
+            'alphabet': library.alphabet.name
+        }
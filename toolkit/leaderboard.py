@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+排行榜模块
+按（词库, 单词长度, 日期）记录玩家最高得分，基于sqlite3索引存储，
+支持前N名与玩家排名查询，以及多会话成绩的无锁提交和批量写入
+"""
+
+import collections
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    library TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    player TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    games INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (library, length, day, player)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_scores_rank ON scores (library, length, day, score DESC);
+
+-- 每个分组内各分数的玩家人数，由触发器在写入 scores 的同一事务中维护。
+-- 得分取值范围很小，按分数求名次只需扫描少量行，与玩家总数无关，
+-- 且直接读数据库，其他会话写入的成绩也能立即反映。
+CREATE TABLE IF NOT EXISTS score_counts (
+    library TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    PRIMARY KEY (library, length, day, score)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_scores_insert AFTER INSERT ON scores
+BEGIN
+    INSERT OR IGNORE INTO score_counts VALUES (new.library, new.length, new.day, new.score, 0);
+    UPDATE score_counts SET players = players + 1
+    WHERE library = new.library AND length = new.length AND day = new.day AND score = new.score;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_scores_update AFTER UPDATE OF score ON scores
+WHEN old.score != new.score
+BEGIN
+    UPDATE score_counts SET players = players - 1
+    WHERE library = old.library AND length = old.length AND day = old.day AND score = old.score;
+    DELETE FROM score_counts
+    WHERE library = old.library AND length = old.length AND day = old.day AND score = old.score
+        AND players <= 0;
+    INSERT OR IGNORE INTO score_counts VALUES (new.library, new.length, new.day, new.score, 0);
+    UPDATE score_counts SET players = players + 1
+    WHERE library = new.library AND length = new.length AND day = new.day AND score = new.score;
+END;
+"""
+
+# 旧数据库升级时根据已有成绩补齐 score_counts
+BACKFILL_SQL = """
+INSERT INTO score_counts (library, length, day, score, players)
+SELECT library, length, day, score, COUNT(*) FROM scores GROUP BY library, length, day, score
+"""
+
+UPSERT_SQL = """
+INSERT INTO scores (library, length, day, player, score, games, updated)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (library, length, day, player) DO UPDATE SET
+    score = max(score, excluded.score),
+    games = games + excluded.games,
+    updated = excluded.updated
+"""
+
+
+def today() -> str:
+    """当天日期字符串"""
+    return time.strftime('%Y-%m-%d')
+
+
+class Leaderboard:
+    """排行榜"""
+    
+    def __init__(self, db_file: str = "leaderboard.db"):
+        self.db_file = db_file
+        self._pending = collections.deque()  # 待写入的成绩，deque 的 append/popleft 本身线程安全，提交时无需加锁
+        self._lock = threading.Lock()  # 保护数据库连接，只在批量写入与查询时持有
+        self._conn = None
+        self._worker = None
+        self._stop_event = threading.Event()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """打开数据库（调用方需持有锁）"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            upgrade = self._conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'score_counts'").fetchone() is None
+            self._conn.executescript(SCHEMA)
+            if upgrade:
+                with self._conn:
+                    self._conn.execute(BACKFILL_SQL)
+        return self._conn
+    
+    def submit(self, player: str, library: str, length: int, score: int, day: Optional[str] = None,
+               on_ranked: Optional[Callable[[Optional[int]], None]] = None):
+        """提交一条成绩（热路径：只入队，不访问数据库）
+
+        给出 on_ranked 时，这条成绩写入后在写入线程中以玩家名次调用它（查询失败时为 None）
+        """
+        self._pending.append((library, length, day or today(), player, score, time.time(), on_ranked))
+    
+    def flush(self) -> int:
+        """把队列中的成绩在一个事务内批量写入，返回写入的成绩条数"""
+        batch = []
+        pop = self._pending.popleft
+        while True:
+            try:
+                batch.append(pop())
+            except IndexError:
+                break
+        if not batch:
+            return 0
+            
+        # 先在内存中按玩家合并，同一玩家同一分组只写一行
+        merged = {}
+        for library, length, day, player, score, updated, _ in batch:
+            key = (library, length, day, player)
+            best = merged.get(key)
+            if best is None:
+                merged[key] = [score, 1, updated]
+            else:
+                best[0] = max(best[0], score)
+                best[1] += 1
+                best[2] = max(best[2], updated)
+                
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(UPSERT_SQL, [key + tuple(value) for key, value in merged.items()])
+        except sqlite3.Error:
+            # 事务未提交，把这批成绩放回队列等待下次写入
+            self._pending.extendleft(reversed(batch))
+            raise
+            
+        # 写入成功后再查询名次并通知提交方
+        for library, length, day, player, _, _, on_ranked in batch:
+            if on_ranked is None:
+                continue
+            try:
+                rank = self.rank(player, library, length, day)
+            except sqlite3.Error as e:
+                print(f"查询排名失败: {e}")
+                rank = None
+            on_ranked(rank)
+        return len(batch)
+    
+    def top(self, library: str, length: int, day: Optional[str] = None, n: int = 10) -> List[Dict[str, Any]]:
+        """查询前N名（走 idx_scores_rank 索引），同分并列，名次与 rank() 一致"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT player, score, games FROM scores WHERE library = ? AND length = ? AND day = ? "
+                "ORDER BY score DESC LIMIT ?", (library, length, day or today(), n)).fetchall()
+        result = []
+        rank = 0
+        for i, (player, score, games) in enumerate(rows):
+            if i == 0 or score != rows[i - 1][1]:
+                rank = i + 1
+            result.append({'rank': rank, 'player': player, 'score': score, 'games': games})
+        return result
+    
+    def rank(self, player: str, library: str, length: int, day: Optional[str] = None) -> Optional[int]:
+        """查询玩家在分组中的名次（同分并列），未上榜返回 None"""
+        group = (library, length, day or today())
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT score FROM scores WHERE library = ? AND length = ? AND day = ? AND player = ?",
+                group + (player,)).fetchone()
+            if row is None:
+                return None
+            higher = conn.execute(
+                "SELECT COALESCE(SUM(players), 0) FROM score_counts "
+                "WHERE library = ? AND length = ? AND day = ? AND score > ?",
+                group + (row[0],)).fetchone()[0]
+            return higher + 1
+    
+    def start(self, interval: float = 1.0):
+        """启动后台写入线程，定期批量写入队列中的成绩"""
+        if self._worker is not None:
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, args=(interval,), daemon=True)
+        self._worker.start()
+    
+    def _run(self, interval: float):
+        while not self._stop_event.wait(interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"写入排行榜失败: {e}")
+    
+    def close(self):
+        """停止后台线程，写入剩余成绩并关闭数据库"""
+        if self._worker is not None:
+            self._stop_event.set()
+            self._worker.join()
+            self._worker = None
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+对局记录与回放
+以紧凑的varint编码把每局游戏追加到滚动日志，并支持流式回放重新模拟
+"""
+
+import os
+import sys
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 每条记录的封装: 同步标记(2字节), 负载字节数(varint), 负载, 负载的CRC32(4字节，小端)
+# 崩溃留下的半条记录或中间损坏的字节可以凭同步标记和校验和跳过，不影响之后的记录
+RECORD_MAGIC = b'\xa5\x5a'
+MAX_PAYLOAD_SIZE = 1 << 20
+
+# 负载中的记录类型标记
+TAG_LIBRARY = 0  # 词库定义: 标记, 词库编号, 名称字节数, UTF-8名称, 快照版本
+TAG_GAME = 1     # 对局: 标记, 词库编号, 开始时间(秒), 目标单词序号, 标志位, 尝试次数, [单词序号, 距开始毫秒数]*
+
+FLAG_WON = 1  # 标志位：获胜
+FLAG_ABANDONED = 2  # 标志位：中途放弃
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def encode_varint(value: int, out: bytearray):
+    """把非负整数以varint（每字节7位）编码追加到out"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(buf, pos: int) -> Tuple[int, int]:
+    """从buf的pos处解码一个varint，返回(值, 新位置)；数据不完整时抛出IndexError"""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+def frame_record(payload: bytes, out: bytearray):
+    """给一条记录的负载加上同步标记、长度和校验和后追加到out"""
+    out += RECORD_MAGIC
+    encode_varint(len(payload), out)
+    out += payload
+    out += zlib.crc32(payload).to_bytes(4, 'little')
+
+
+class GameRecorder:
+    """对局记录器：把结束或放弃的对局追加到滚动日志文件"""
+
+    def __init__(self, filename: str = "game_records.bin",
+                 max_bytes: int = 4 * 1024 * 1024, backup_count: int = 3):
+        self.filename = filename
+        self.max_bytes = max_bytes  # 单个日志文件上限，超过后滚动
+        self.backup_count = backup_count  # 保留的历史日志数量
+        self.library_ids = None  # 当前日志中的词库编号 {(词库名, 快照版本): 编号}，首次写入时加载
+        self.next_id = 0  # 下一个可分配的词库编号，大于日志中出现过的任何编号（包括定义已损坏的）
+        self._scanned = 0  # 已扫描到的日志偏移，之后的内容可能由其他实例追加
+
+    def _open_log(self):
+        """扫描现有日志，恢复词库编号表，并截掉末尾不完整的记录"""
+        self.library_ids = {}
+        self.next_id = 0
+        self._scanned = 0
+        if not os.path.exists(self.filename):
+            return
+        self._scan_log()
+        if self._scanned < os.path.getsize(self.filename):
+            with open(self.filename, 'r+b') as f:
+                f.truncate(self._scanned)
+
+    def _scan_log(self):
+        """从上次扫描的位置读取日志，登记出现过的词库编号"""
+        reader = LogReader(self.filename, self._scanned)
+        for record in reader:
+            lib_id = record[1]
+            if lib_id >= self.next_id:
+                self.next_id = lib_id + 1
+            if record[0] == TAG_LIBRARY:
+                self.library_ids.setdefault((record[2], record[3]), lib_id)
+        self._scanned = reader.valid_end
+
+    def _sync_log(self):
+        """写入前同步日志状态：首次写入时完整扫描，之后只读取其他实例追加的部分"""
+        size = os.path.getsize(self.filename) if os.path.exists(self.filename) else 0
+        if self.library_ids is None or size < self._scanned:
+            self._open_log()  # 首次写入，或日志已被其他实例滚动
+        elif size > self._scanned:
+            self._scan_log()
+
+    def _rotate(self):
+        """滚动日志：game_records.bin -> .1 -> .2 ..."""
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.filename}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.filename}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.filename, f"{self.filename}.1")
+        else:
+            os.remove(self.filename)
+        self.library_ids = {}
+        self.next_id = 0
+        self._scanned = 0
+
+    def encode_game(self, library: str, version: int, start_time: float, target_index: int, won: bool,
+                    guesses: List[Tuple[int, float]], out: bytearray, abandoned: bool = False):
+        """把一局编码追加到out，词库或其快照版本首次出现时先写入词库定义"""
+        lib_id = self.library_ids.get((library, version))
+        if lib_id is None:
+            lib_id = self.next_id
+            self.next_id += 1
+            self.library_ids[(library, version)] = lib_id
+            name = library.encode('utf-8')
+            payload = bytearray([TAG_LIBRARY])
+            encode_varint(lib_id, payload)
+            encode_varint(len(name), payload)
+            payload += name
+            encode_varint(version, payload)
+            frame_record(payload, out)
+
+        payload = bytearray([TAG_GAME])
+        encode_varint(lib_id, payload)
+        encode_varint(int(start_time), payload)
+        encode_varint(target_index, payload)
+        encode_varint((FLAG_WON if won else 0) | (FLAG_ABANDONED if abandoned else 0), payload)
+        encode_varint(len(guesses), payload)
+        for word_index, guess_time in guesses:
+            encode_varint(word_index, payload)
+            encode_varint(max(0, int((guess_time - start_time) * 1000)), payload)
+        frame_record(payload, out)
+
+    def record_game(self, game) -> bool:
+        """记录一局已结束或放弃的游戏（WordGame.recorder 回调）"""
+        try:
+            library = game.library
+            index = library.index
+            guesses = [(index[word], t) for word, t in zip(game.attempts, game.attempt_times)]
+
+            self._sync_log()
+            if os.path.exists(self.filename) and os.path.getsize(self.filename) >= self.max_bytes:
+                self._rotate()
+
+            out = bytearray()
+            self.encode_game(library.name, library.version, game.start_time, index[game.target_word],
+                             game.won, guesses, out, game.abandoned)
+            with open(self.filename, 'ab') as f:
+                f.write(out)
+            return True
+        except Exception as e:
+            print(f"记录对局失败: {e}")
+            return False
+
+
+def log_files(filename: str) -> List[str]:
+    """返回滚动日志的全部文件，按时间从旧到新排列"""
+    files = []
+    i = 1
+    while os.path.exists(f"{filename}.{i}"):
+        files.append(f"{filename}.{i}")
+        i += 1
+    files.reverse()
+    if os.path.exists(filename):
+        files.append(filename)
+    return files
+
+
+class LogReader:
+    """流式解析单个日志文件
+
+    词库定义以 (TAG_LIBRARY, 词库编号, 词库名, 快照版本) 产出；对局以
+    (TAG_GAME, 词库编号, 开始时间, 目标序号, 标志位, 尝试列表) 产出，
+    其中尝试列表 [单词序号, 毫秒数, ...] 在迭代间复用，只在下一次迭代前有效。
+    校验失败、类型未知或被截断的记录不会中断读取：计入 corrupt 后
+    跳到下一个同步标记继续。
+    """
+
+    def __init__(self, path: str, offset: int = 0):
+        self.path = path
+        self.offset = offset  # 开始读取的文件偏移，应位于记录边界
+        self.corrupt = 0  # 跳过的损坏片段数
+        self.valid_end = offset  # 最后一条有效记录之后的文件偏移
+
+    def __iter__(self) -> Iterator[tuple]:
+        guesses = []
+        buf = b''
+        pos = 0
+        base = self.offset  # buf[0] 在文件中的偏移
+        skipping = False  # 是否正处于一段损坏数据中
+        eof = False
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while not eof:
+                chunk = f.read(READ_CHUNK_SIZE)
+                eof = not chunk
+                base += pos
+                buf = buf[pos:] + chunk
+                pos = 0
+                end = len(buf)
+                while pos < end:
+                    if buf.startswith(RECORD_MAGIC, pos):
+                        try:
+                            size, start = decode_varint(buf, pos + len(RECORD_MAGIC))
+                            stop = start + size
+                            if size <= MAX_PAYLOAD_SIZE and stop + 4 > end:
+                                raise IndexError
+                        except IndexError:
+                            if not eof:
+                                break  # 记录跨越了块边界，等待读入下一块
+                            size = MAX_PAYLOAD_SIZE + 1  # 文件已结束，按损坏处理
+                        if size <= MAX_PAYLOAD_SIZE:
+                            payload = buf[start:stop]
+                            if zlib.crc32(payload) == int.from_bytes(buf[stop:stop + 4], 'little'):
+                                pos = stop + 4
+                                skipping = False
+                                record = self._decode(payload, guesses)
+                                if record is None:
+                                    self.corrupt += 1
+                                    continue
+                                self.valid_end = base + pos
+                                yield record
+                                continue
+                    elif not eof and end - pos < len(RECORD_MAGIC):
+                        break  # 同步标记可能被块边界切开
+
+                    # 损坏的数据：跳到下一个同步标记
+                    if not skipping:
+                        skipping = True
+                        self.corrupt += 1
+                    found = buf.find(RECORD_MAGIC, pos + 1)
+                    if found == -1:
+                        # 保留末尾可能被块边界切开的同步标记
+                        pos = end if eof else max(pos + 1, end - len(RECORD_MAGIC) + 1)
+                        break
+                    pos = found
+
+    @staticmethod
+    def _decode(payload: bytes, guesses: list) -> Optional[tuple]:
+        """解码一条记录的负载，类型未知或格式错误时返回 None"""
+        try:
+            tag = payload[0]
+            if tag == TAG_LIBRARY:
+                lib_id, pos = decode_varint(payload, 1)
+                size, pos = decode_varint(payload, pos)
+                name = payload[pos:pos + size].decode('utf-8')
+                version, _ = decode_varint(payload, pos + size)
+                return (TAG_LIBRARY, lib_id, name, version)
+            if tag == TAG_GAME:
+                lib_id, pos = decode_varint(payload, 1)
+                start_time, pos = decode_varint(payload, pos)
+                target_index, pos = decode_varint(payload, pos)
+                flags, pos = decode_varint(payload, pos)
+                count, pos = decode_varint(payload, pos)
+                guesses.clear()
+                for _ in range(count * 2):
+                    value, pos = decode_varint(payload, pos)
+                    guesses.append(value)
+                return (TAG_GAME, lib_id, start_time, target_index, flags, guesses)
+        except (IndexError, UnicodeDecodeError):
+            pass
+        return None
+
+
+def iter_games(filename: str = "game_records.bin", stats: Optional['ReplayStats'] = None) -> Iterator[tuple]:
+    """按时间顺序流式读取全部对局
+
+    产出 (词库名, 快照版本, 开始时间, 目标序号, 是否获胜, 是否放弃, 尝试列表)，尝试列表为
+    [单词序号, 距开始毫秒数, ...] 的扁平列表，在迭代间复用。
+    给出 stats 时，跳过的损坏记录数累加到 stats.corrupt。
+    """
+    for path in log_files(filename):
+        libraries = {}  # {词库编号: (词库名, 快照版本)}
+        reader = LogReader(path)
+        for record in reader:
+            if record[0] == TAG_LIBRARY:
+                libraries[record[1]] = (record[2], record[3])
+            else:
+                _, lib_id, start_time, target_index, flags, guesses = record
+                name, version = libraries.get(lib_id, (None, None))
+                yield (name, version, start_time, target_index, bool(flags & FLAG_WON),
+                       bool(flags & FLAG_ABANDONED), guesses)
+        if stats is not None:
+            stats.corrupt += reader.corrupt
+
+
+class ReplayStats:
+    """回放统计"""
+
+    def __init__(self):
+        self.games = 0  # 回放的对局数
+        self.wins = 0  # 重新模拟后获胜的对局数
+        self.abandoned = 0  # 中途放弃的对局数（按记录的猜测重新模拟，仍计入 games）
+        self.skipped = 0  # 词库缺失或序号越界而跳过的对局数
+        self.stale = 0  # 记录所用的词库快照版本与当前加载的不同而跳过的对局数
+        self.mismatches = 0  # 重新模拟结果与记录不一致的对局数
+        self.corrupt = 0  # 日志中跳过的损坏记录数
+        self.attempts_distribution = {}  # 获胜对局的尝试次数分布 {次数: 局数}
+
+    def to_dict(self) -> Dict[str, object]:
+        """转换为字典，便于用 GameUtils.save_game_stats 保存"""
+        return {
+            'games': self.games,
+            'wins': self.wins,
+            'win_rate': self.wins / self.games if self.games else 0,
+            'abandoned': self.abandoned,
+            'skipped': self.skipped,
+            'stale': self.stale,
+            'mismatches': self.mismatches,
+            'corrupt': self.corrupt,
+            'attempts_distribution': dict(sorted(self.attempts_distribution.items()))
+        }
+
+
+def replay_games(game, filename: str = "game_records.bin",
+                 stats: Optional[ReplayStats] = None) -> ReplayStats:
+    """把记录的对局逐一在 game（已加载词库的 WordGame）上重新模拟
+
+    全程复用同一个 WordGame 对象，可用于重新计算统计，或在修改规则后
+    检查有多少对局的胜负发生变化。
+    """
+    if stats is None:
+        stats = ReplayStats()
+    recorder = game.recorder
+    game.recorder = None  # 回放时不再记录
+    distribution = stats.attempts_distribution
+    try:
+        for library, version, _, target_index, won, abandoned, guesses in iter_games(filename, stats):
+            index = game.libraries.get(library)
+            if index is None or target_index >= len(index.words):
+                stats.skipped += 1
+                continue
+            if index.version != version:
+                stats.stale += 1  # 词库已修改，记录中的单词序号对应的是旧快照
+                continue
+            game.current_library = library
+            words = index.words
+            game.begin_game(words[target_index], index)
+            for i in range(0, len(guesses), 2):
+                if game.game_over:
+                    break
+                word_index = guesses[i]
+                if word_index < len(words):
+                    game.make_guess(words[word_index])
+
+            stats.games += 1
+            if abandoned:
+                stats.abandoned += 1
+            if game.won:
+                stats.wins += 1
+                count = len(game.attempts)
+                distribution[count] = distribution.get(count, 0) + 1
+            if game.won != won:
+                stats.mismatches += 1
+    finally:
+        game.recorder = recorder
+    return stats
+
+
+def main(record_file: str, wordlib_dir: str = "wordlib"):
+    from toolkit.core import WordGame
+
+    game = WordGame()
+    game.load_word_libraries(wordlib_dir)
+    t0 = time.perf_counter()
+    stats = replay_games(game, record_file)
+    elapsed = time.perf_counter() - t0
+    for key, value in stats.to_dict().items():
+        print(f"{key}: {value}")
+    print(f"回放 {stats.games} 局，耗时 {elapsed:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "game_records.bin")
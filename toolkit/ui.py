@@ -1,19 +1,28 @@
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import List, Tuple
-from toolkit.core import WordGame
 
 class WordGameUI:
     """英语单词猜词游戏界面"""
     
-    def __init__(self):
+    def __init__(self, exit_after_load: bool = False):
+        # 启动阶段时间点 {阶段名: perf_counter}
+        self.startup_marks = {'init': time.perf_counter()}
+        self.exit_after_load = exit_after_load  # 加载完词库后立即退出（用于启动测速）
+        self._first_paint_done = False
+        
         self.root = tk.Tk()
         self.root.title("英语单词趣味猜词游戏")
         self.root.geometry("800x600")
         self.root.resizable(True, True)
         
-        # 游戏核心逻辑
-        self.game = WordGame()
+        # 游戏核心逻辑，首帧之后在 _deferred_load 中创建
+        self.game = None
+        self.watcher = None  # 词库热更新监视器，词库加载完成后启动
+        self.leaderboard = None  # 排行榜，首次得分时再创建（避免启动时加载sqlite3）
+        self.rank_results = None  # 后台写入线程查到的 (得分, 名次)，由界面线程轮询
+        self.player_name = None  # 玩家名，首次得分时获取
         
         # 界面变量
         self.selected_library = tk.StringVar()
@@ -23,9 +32,37 @@ class WordGameUI:
         
         # 创建界面
         self.create_widgets()
+        self.startup_marks['widgets'] = time.perf_counter()
+        
+        # 词库在首帧绘制之后再加载，先让窗口尽快显示出来
+        self.status_label.config(text="正在加载词库...")
+        self.root.bind("<Map>", self._on_first_map, add="+")
         
-        # 加载词库
+    def _on_first_map(self, event):
+        """窗口首次映射：完成首帧绘制后再调度词库加载"""
+        if self._first_paint_done or event.widget is not self.root:
+            return
+        self._first_paint_done = True
+        self.root.update_idletasks()
+        self.startup_marks['first_paint'] = time.perf_counter()
+        self.root.after(1, self._deferred_load)
+        
+    def _deferred_load(self):
+        """首帧之后导入游戏逻辑并加载词库"""
+        from toolkit.core import WordGame
+        from toolkit.replay import GameRecorder
+        self.game = WordGame()
+        self.game.recorder = GameRecorder()  # 结束的对局追加到滚动日志
         self.load_libraries()
+        self.startup_marks['libraries'] = time.perf_counter()
+        if self.exit_after_load:
+            self.root.after(0, self.root.destroy)
+            return
+        # 监视词库目录，修改后的词库在后台重建并替换
+        from toolkit.watcher import LibraryWatcher
+        self.watcher = LibraryWatcher(self.game)
+        self.watcher.start()
+        self.root.after(1000, self.poll_library_changes)
         
     def create_widgets(self):
         """创建界面组件"""
@@ -170,7 +207,7 @@ class WordGameUI:
             # 更新词库信息
             info = self.game.get_library_info()
             self.library_info_label.config(
-                text=f"词库: {info['name']} | 总单词数: {info['total_words']}"
+                text=f"词库: {info['name']} | 总单词数: {info['total_words']} | 字母表: {info['alphabet']}"
             )
             
             # 更新可用长度
@@ -183,6 +220,31 @@ class WordGameUI:
         else:
             self.library_info_label.config(text="词库选择失败")
             
+    def poll_library_changes(self):
+        """在界面线程中处理后台热更新完成的词库"""
+        changed = set()
+        while not self.watcher.changes.empty():
+            changed.add(self.watcher.changes.get())
+        if changed:
+            self.library_combo['values'] = list(self.game.word_library.keys())
+            current = self.selected_library.get()
+            if current in changed:
+                info = self.game.get_library_info()
+                if info:
+                    self.library_info_label.config(
+                        text=f"词库: {info['name']} | 总单词数: {info['total_words']} | 字母表: {info['alphabet']}"
+                    )
+                    self.length_combo['values'] = self.game.get_available_lengths()
+                    self.status_label.config(text=f"词库 {current} 已更新，新对局将使用新词库")
+                else:
+                    # 清空选择，避免开始新游戏时误报“没有该长度的单词”；进行中的对局不受影响
+                    self.game.current_library = None
+                    self.library_combo.set("")
+                    self.length_combo['values'] = []
+                    self.length_combo.set("")
+                    self.library_info_label.config(text=f"词库 {current} 已被删除，请重新选择词库")
+        self.root.after(1000, self.poll_library_changes)
+            
     def start_new_game(self):
         """开始新游戏"""
         if not self.selected_library.get():
@@ -259,6 +321,8 @@ class WordGameUI:
             if row < len(status['attempts']):
                 word = status['attempts'][row]
                 feedback = self.game._generate_feedback(word)
+                if feedback is None:
+                    feedback = [(letter, "white") for letter in word]
             else:
                 feedback = [("", "white")] * word_length
             for col, (letter, color) in enumerate(feedback):
@@ -287,9 +351,11 @@ class WordGameUI:
     def on_entry_key(self, event, idx):
         entry = self.guess_entries[idx]
         value = entry.get()
-        # 只允许一个字母
-        if len(value) > 1:
-            entry.delete(1, tk.END)
+        # 只允许一个字母（按字素簇计，带声调/变音符号的字母算一个）
+        from toolkit.alphabet import split_graphemes
+        letters = split_graphemes(value)
+        if len(letters) > 1:
+            entry.delete(len(letters[0]), tk.END)
         # 自动跳到下一个
         if value and idx + 1 < len(self.guess_entries):
             self.guess_entries[idx + 1].focus()
@@ -323,8 +389,13 @@ class WordGameUI:
         status = self.game.get_game_status()
         if status['game_over']:
             if status['won']:
+                from toolkit.utils import GameUtils
+                score = GameUtils.calculate_score(status['current_attempts'], status['max_attempts'],
+                                                  status['word_length'])
+                # 先更新状态栏：排名在后台写入后才显示，可能在提示框打开期间到达
+                self.status_label.config(text=f"游戏胜利！得分: {score}")
+                self.record_score(score, status['word_length'])
                 messagebox.showinfo("恭喜", f"恭喜你赢了！目标单词是: {status['target_word']}")
-                self.status_label.config(text="游戏胜利！")
             else:
                 messagebox.showinfo("游戏结束", f"游戏结束！目标单词是: {status['target_word']}")
                 self.status_label.config(text="游戏失败！")
@@ -333,6 +404,44 @@ class WordGameUI:
                 text=f"剩余尝试次数: {status['remaining_attempts']}"
             )
             
+    def record_score(self, score, word_length):
+        """提交得分到排行榜，由后台线程写入，写入后在状态栏显示今日排名"""
+        try:
+            if self.leaderboard is None:
+                import getpass
+                import queue
+                from toolkit.leaderboard import Leaderboard
+                self.leaderboard = Leaderboard()
+                self.leaderboard.start()  # 后台线程批量写入，界面线程不访问数据库
+                self.rank_results = queue.SimpleQueue()
+                try:
+                    self.player_name = getpass.getuser()
+                except Exception:
+                    self.player_name = "玩家"
+            library = self.game.library.name  # 本局实际使用的词库，而非下拉框当前选择
+            results = self.rank_results
+            self.leaderboard.submit(self.player_name, library, word_length, score,
+                                    on_ranked=lambda rank: results.put((score, rank)))
+            self.root.after(200, self.poll_rank_results)
+        except Exception as e:
+            print(f"记录排行榜失败: {e}")
+            
+    def poll_rank_results(self):
+        """在界面线程中显示后台写入后查到的排名"""
+        if self.rank_results.empty():
+            self.root.after(200, self.poll_rank_results)
+            return
+        score, rank = self.rank_results.get()
+        # 已经开始新的一局时不再覆盖状态栏
+        if rank and self.game.game_over:
+            self.status_label.config(text=f"游戏胜利！得分: {score}，今日排名: 第{rank}名")
+            
     def run(self):
         """运行界面"""
-        self.root.mainloop() 
\ No newline at end of file
+        self.root.mainloop()
+        if self.game is not None:
+            self.game.abandon_game()  # 退出时记录尚未结束的对局
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.leaderboard is not None:
+            self.leaderboard.close() 
\ No newline at end of file
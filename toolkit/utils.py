@@ -8,7 +8,8 @@
 import os
 import json
 import time
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from toolkit.alphabet import Alphabet, UNICODE, grapheme_length
 
 class GameUtils:
     """游戏工具类"""
@@ -36,17 +37,17 @@ class GameUtils:
         return {}
     
     @staticmethod
-    def validate_word(word: str) -> bool:
+    def validate_word(word: str, alphabet: Optional[Alphabet] = None) -> bool:
         """验证单词格式"""
         if not word:
             return False
-        # 检查是否只包含字母
-        return word.isalpha()
+        # 检查是否只包含字母表中的字母（未指定时接受任意语言的字母）
+        return (alphabet or UNICODE).is_valid(word)
     
     @staticmethod
     def get_word_difficulty(word: str) -> str:
         """评估单词难度"""
-        length = len(word)
+        length = grapheme_length(word)
         if length <= 3:
             return "简单"
         elif length <= 5:
@@ -110,14 +111,14 @@ class WordLibraryUtils:
             
             length_stats = {}
             for word in words:
-                length = len(word)
+                length = grapheme_length(word)
                 length_stats[length] = length_stats.get(length, 0) + 1
             
             return {
                 'total_words': len(words),
                 'unique_words': len(set(words)),
                 'length_stats': length_stats,
-                'avg_length': sum(len(word) for word in words) / len(words) if words else 0
+                'avg_length': sum(length * count for length, count in length_stats.items()) / len(words) if words else 0
             }
         except Exception as e:
             print(f"获取词库统计失败: {e}")
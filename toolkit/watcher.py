@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+词库热更新
+轮询词库目录中各文件的修改时间，某个词库变化时在后台线程中只重建该词库的索引，
+再整体替换到 WordGame 中；进行中的对局继续使用旧快照直到结束
+"""
+
+import os
+import queue
+import threading
+from typing import Dict, List, Tuple
+from toolkit.core import LibraryIndex
+
+class LibraryWatcher:
+    """词库目录监视器"""
+    
+    def __init__(self, game, wordlib_dir: str = "wordlib", interval: float = 1.0):
+        self.game = game
+        self.wordlib_dir = wordlib_dir
+        self.interval = interval  # 轮询间隔（秒）
+        self.changes = queue.SimpleQueue()  # 已完成替换的词库名，供界面线程轮询
+        # {词库名: (修改时间ns, 文件大小)}，以各词库加载时记录的文件状态为基准，
+        # 加载之后、监视器创建之前的修改也能被发现
+        self._files = {name: index.signature for name, index in game.libraries.items()
+                       if index.signature is not None}
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """扫描词库目录，返回各词库文件的修改时间和大小"""
+        files = {}
+        try:
+            with os.scandir(self.wordlib_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.txt') and entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name.replace('.txt', '')] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            print(f"扫描词库目录失败: {e}")
+        return files
+    
+    def check(self) -> List[str]:
+        """检查一次目录变化，重建并替换变化的词库，返回发生变化的词库名"""
+        files = self.scan()
+        changed = []
+        for name, signature in files.items():
+            if self._files.get(name) == signature:
+                continue
+            filepath = os.path.join(self.wordlib_dir, name + '.txt')
+            try:
+                index = LibraryIndex.from_file(name, filepath)
+            except Exception as e:
+                print(f"重新加载词库 {name} 失败: {e}")
+                continue
+            self.game.install_library(index)
+            self._files[name] = index.signature
+            changed.append(name)
+            
+        for name in list(self._files):
+            if name not in files:
+                self.game.remove_library(name)
+                del self._files[name]
+                changed.append(name)
+                
+        for name in changed:
+            self.changes.put(name)
+        return changed
+    
+    def start(self):
+        """启动后台轮询线程"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.check()
+    
+    def stop(self):
+        """停止后台轮询线程"""
+        if self._thread is not None:
+            self._stop_event.set()
+            self._thread.join()
+            self._thread = None
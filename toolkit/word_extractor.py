@@ -1,13 +1,19 @@
 import re
 import sys
+import unicodedata
 
-def extract_words(text):
+# 拉丁字母（含带变音符号的字母和组合符号），覆盖英语、德语、法语和汉语拼音词库
+LATIN_LETTERS = 'A-Za-z\u00c0-\u00d6\u00d8-\u00f6\u00f8-\u024f\u1e00-\u1eff\u0300-\u036f'
+
+def extract_words(text, letters=LATIN_LETTERS):
+    """提取每行开头的单词；letters 为允许的字母（正则字符类内容），中文释义等不会被当作单词"""
     words = []
-    # 匹配每行中的英文单词（忽略词性和解释）
-    pattern = r'^([a-zA-Z-]+)\s+[a-zA-Z.]*\s*'
+    # 匹配每行开头的单词（字母、连字符和撇号，忽略词性和解释）
+    pattern = rf"^([{letters}][{letters}'-]*)\s+[a-zA-Z.]*\s*"
     
     for line in text.split('\n'):
-        line = line.strip()
+        # 先做NFC规范化，把“字母+组合符号”合成为单个字符
+        line = unicodedata.normalize('NFC', line.strip())
         if line:
             match = re.match(pattern, line)
             if match: